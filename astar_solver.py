@@ -1,5 +1,9 @@
 import heapq
 import time
+from collections import deque
+
+from ricochet_model import DIRECTIONS, MOVE_COST
+from instance_filter import stop_cells
 
 class AStarNode:
     def __init__(self, state, parent=None, g=0, h=0):
@@ -23,21 +27,30 @@ class AStarSolver:
         self.nodes_generated = 0
         self.max_memory = 0
         
-    def solve(self, start_state):
+    def solve(self, start_state, heuristic=None):
+        """
+        A* from `start_state`, with `heuristic` (default: the solver's
+        heuristic_func). Returns a result dict, or None if there is no solution.
+        """
+        heuristic = heuristic or self.heuristic
+        if heuristic is None:
+            raise ValueError("AStarSolver.solve needs a heuristic_func (solve_target_table does not)")
         start_time = time.time()
         
         # Open list (Priority Queue)
         open_list = []
-        start_node = AStarNode(start_state, g=0, h=self.heuristic(start_state, self.env))
+        start_node = AStarNode(start_state, g=0, h=heuristic(start_state, self.env))
         heapq.heappush(open_list, start_node)
         
         # Closed set for "duplicate elimination and no reopening" 
-        # We store states we have already Expanded (or visited)
+        # We store states we have already Expanded (or visited).
+        # States are keyed by their 64-bit Zobrist hash, so successors can be
+        # checked before they are built (a collision is astronomically unlikely).
         closed_set = set()
         
         # To handle duplicate detection in Open List effectively without reopening,
         # we can track best g-values seen so far.
-        g_score = {start_state: 0}
+        g_score = {start_state.zhash: 0}
 
         while open_list:
             # Update max memory metric [cite: 92]
@@ -45,36 +58,98 @@ class AStarSolver:
             
             # Pop node with lowest f
             current_node = heapq.heappop(open_list)
+            current_state = current_node.state
             
-            if current_node.state in closed_set:
+            if current_state.zhash in closed_set:
                 continue
             
             # Goal Check
-            if self.env.is_goal(current_node.state):
+            if self.env.is_goal(current_state):
                 return self._reconstruct_path(current_node, start_time)
             
             # Add to closed set (Explored)
-            closed_set.add(current_node.state)
+            closed_set.add(current_state.zhash)
             self.nodes_expanded += 1
             
-            # Expand
-            for neighbor_state, cost in self.env.get_neighbors(current_node.state):
-                tentative_g = current_node.g + cost
-                
+            # Expand: successors arrive as (robot, new position, hash) deltas
+            # and are only materialized if they pass the duplicate check
+            tentative_g = current_node.g + MOVE_COST
+            for robot_idx, new_pos, zhash in self.env.get_successor_deltas(current_state):
                 # Check if we found a better path or if it's new
                 # Note: "No reopening" usually implies if it's in closed, we ignore it.
-                if neighbor_state in closed_set:
+                if zhash in closed_set:
                     continue
                 
-                if neighbor_state not in g_score or tentative_g < g_score[neighbor_state]:
-                    g_score[neighbor_state] = tentative_g
-                    h_val = self.heuristic(neighbor_state, self.env)
+                if zhash not in g_score or tentative_g < g_score[zhash]:
+                    g_score[zhash] = tentative_g
+                    neighbor_state = current_state.moved(robot_idx, new_pos, zhash)
+                    h_val = heuristic(neighbor_state, self.env)
                     new_node = AStarNode(neighbor_state, current_node, tentative_g, h_val)
                     heapq.heappush(open_list, new_node)
                     self.nodes_generated += 1
                     
         return None # Failure
 
+    def solve_target_table(self, start_state):
+        """
+        Optimal A* for known-goal queries, guided by target_distances: a
+        backward breadth-first search from the goal over the target robot
+        alone, with the other robots left unconstrained. Its distances never
+        overestimate and change by at most one per move, so the search stays
+        optimal without reopening, and the table grows with the board, not
+        with the number of robots. Works without a heuristic_func.
+        Returns the same result dict as solve() plus "table_cells" (size of
+        the table, not counted in "expanded"), or None if there is no solution.
+        """
+        start_time = time.time()
+        table = self.target_distances(start_state)
+        target_idx = self.env.target_idx
+        if start_state.robots[target_idx] not in table:
+            return None # Failure: even the relaxed target cannot reach the goal
+
+        inf = float('inf')
+        result = self.solve(start_state, lambda state, env: table.get(state.robots[target_idx], inf))
+        if result is not None:
+            result["time"] = time.time() - start_time
+            result["table_cells"] = len(table)
+        return result
+
+    def target_distances(self, start_state):
+        """
+        Backward search from the goal over target robot cells only.
+        Returns cell -> number of moves the target needs if every other robot
+        could be on any cell it can rest on (a lower bound on the real moves).
+        """
+        env = self.env
+        cells = stop_cells(env, start_state)
+        blockers = set()
+        for i, robot_cells in enumerate(cells):
+            if i != env.target_idx:
+                blockers |= robot_cells
+
+        def inside(x, y):
+            return 0 <= x < env.size and 0 <= y < env.size
+
+        table = {env.goal_pos: 0}
+        queue = deque([env.goal_pos])
+        while queue:
+            x, y = queue.popleft()
+            depth = table[(x, y)] + MOVE_COST
+            for dx, dy in DIRECTIONS:
+                # A slide moving (dx, dy) can stop on (x, y) at a wall, the
+                # border or a cell another robot may be resting on
+                bx, by = x + dx, y + dy
+                if inside(bx, by) and not env.is_wall_blocking(x, y, dx, dy) and (bx, by) not in blockers:
+                    continue
+                # ... and it may have started anywhere back along the line
+                cx, cy = x, y
+                while inside(cx - dx, cy - dy) and not env.is_wall_blocking(cx - dx, cy - dy, dx, dy):
+                    cx, cy = cx - dx, cy - dy
+                    if (cx, cy) not in table:
+                        table[(cx, cy)] = depth
+                        queue.append((cx, cy))
+        return table
+
     def _reconstruct_path(self, node, start_time):
         path = []
         while node:
@@ -0,0 +1,271 @@
+import argparse
+import hashlib
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+
+from ricochet_model import DIRECTIONS
+from astar_solver import AStarSolver
+from instance_generator import generate_random_instance
+from main import heuristic_bfs
+
+# ==========================================
+# CONFIGURATION
+# ==========================================
+BASELINE_FILE = "benchmark_baseline.json"
+
+# Relative slowdown that counts as a regression (0.20 = 20%). Runs on a
+# shared machine vary by more than 10% even with identical code.
+DEFAULT_THRESHOLD = 0.20
+
+# Each benchmark is run this many times and the fastest run is kept,
+# which filters out most scheduler noise.
+DEFAULT_REPEAT = 10
+
+# Fixed, seeded corpus: (size, num_walls, num_robots, seed).
+# The seeds were picked once as the solvable, non-trivial instances, so every
+# A* run terminates and actually searches. The list is explicit on purpose:
+# changes to the model or the prefilter must not change what is measured.
+CORPUS_SPEC = [
+    (size, size * 2, robots, seed)
+    for size, robots, seeds in [
+        (5, 2, [1, 2, 3, 4, 5, 7, 8]),
+        (5, 3, [1, 3, 4, 5, 6, 7, 8]),
+        (6, 2, [1, 2, 3, 4, 5, 6, 7]),
+        (6, 3, [1, 2, 3, 4, 5, 6, 8]),
+        (7, 2, [1, 2, 3, 4, 5, 7, 8]),
+        (7, 3, [1, 2, 3, 4, 5, 6, 8]),
+        (8, 2, [1, 3, 4, 5, 7]),
+        (8, 3, [1, 2, 3, 4, 5, 6, 7, 8]),
+    ]
+    for seed in seeds
+]
+
+# Number of states sampled per instance for the per-call micro-benchmarks
+STATES_PER_INSTANCE = 50
+
+# Metrics where a lower value is better; everything else is a throughput
+LOWER_IS_BETTER = {"solve_p50_ms", "solve_p90_ms", "solve_p99_ms"}
+
+# ==========================================
+# CORPUS
+# ==========================================
+def build_corpus():
+    """
+    Returns a list of (env, start_state) pairs from CORPUS_SPEC.
+    """
+    return [generate_random_instance(size, num_walls, num_robots=num_robots, seed=seed)
+            for size, num_walls, num_robots, seed in CORPUS_SPEC]
+
+def corpus_fingerprint(corpus):
+    """
+    Short hash of the boards, goals and start positions, so results from a
+    different corpus (e.g. after a generator change) are never compared.
+    """
+    digest = hashlib.sha1()
+    for env, state in corpus:
+        digest.update(repr((env.size, sorted(env.walls), env.goal_pos,
+                            env.target_idx, state.robots)).encode())
+    return digest.hexdigest()[:16]
+
+def sample_states(env, start_state, limit=STATES_PER_INSTANCE):
+    """
+    First `limit` states reached by a breadth-first walk from the start.
+    Gives the micro-benchmarks realistic robot placements.
+    """
+    states = [start_state]
+    seen = {start_state}
+    i = 0
+    while i < len(states) and len(states) < limit:
+        for neighbor, _ in env.get_neighbors(states[i]):
+            if neighbor not in seen:
+                seen.add(neighbor)
+                states.append(neighbor)
+        i += 1
+    return states[:limit]
+
+def percentile(values, p):
+    """
+    Nearest-rank percentile of a non-empty list.
+    """
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(p / 100.0 * len(ordered))) - 1))
+    return ordered[rank]
+
+# ==========================================
+# BENCHMARKS
+# ==========================================
+def bench_slide(samples, repeat):
+    """
+    Slides per second: every robot of every sampled state, in every direction.
+    """
+    best = float('inf')
+    count = 0
+    for _ in range(repeat):
+        count = 0
+        start = time.perf_counter()
+        for env, states in samples:
+            for state in states:
+                positions = set(state.robots)
+                for rx, ry in state.robots:
+                    for dx, dy in DIRECTIONS:
+                        env._slide(rx, ry, dx, dy, positions)
+                        count += 1
+        best = min(best, time.perf_counter() - start)
+    return count / best
+
+def bench_neighbors(samples, repeat):
+    """
+    Successors per second produced by get_neighbors.
+    """
+    best = float('inf')
+    count = 0
+    for _ in range(repeat):
+        count = 0
+        start = time.perf_counter()
+        for env, states in samples:
+            for state in states:
+                count += len(env.get_neighbors(state))
+        best = min(best, time.perf_counter() - start)
+    return count / best
+
+def bench_heuristic(samples, repeat):
+    """
+    Heuristic evaluations per second.
+    """
+    best = float('inf')
+    count = 0
+    for _ in range(repeat):
+        count = 0
+        start = time.perf_counter()
+        for env, states in samples:
+            for state in states:
+                heuristic_bfs(state, env)
+                count += 1
+        best = min(best, time.perf_counter() - start)
+    return count / best
+
+def bench_astar(corpus, repeat):
+    """
+    A* expansions per second over the corpus, plus per-instance solve latency
+    percentiles (each instance keeps its fastest run).
+    """
+    latencies = []
+    total_expanded = 0
+    for env, state in corpus:
+        best = float('inf')
+        for _ in range(repeat):
+            solver = AStarSolver(env, heuristic_bfs)
+            start = time.perf_counter()
+            result = solver.solve(state)
+            best = min(best, time.perf_counter() - start)
+        total_expanded += result["expanded"] if result else solver.nodes_expanded
+        latencies.append(best)
+
+    return {
+        "astar_expansions_per_sec": total_expanded / sum(latencies),
+        "solve_p50_ms": percentile(latencies, 50) * 1000,
+        "solve_p90_ms": percentile(latencies, 90) * 1000,
+        "solve_p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+def run_benchmarks(repeat=DEFAULT_REPEAT):
+    corpus = build_corpus()
+    samples = [(env, sample_states(env, state)) for env, state in corpus]
+
+    metrics = {
+        "slides_per_sec": bench_slide(samples, repeat),
+        "successors_per_sec": bench_neighbors(samples, repeat),
+        "heuristic_evals_per_sec": bench_heuristic(samples, repeat),
+    }
+    metrics.update(bench_astar(corpus, repeat))
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "machine": platform.node(),
+            "platform": platform.platform(),
+            "instances": len(corpus),
+            "corpus": corpus_fingerprint(corpus),
+            "repeat": repeat,
+        },
+        "metrics": metrics,
+    }
+
+# ==========================================
+# BASELINES
+# ==========================================
+def save_baseline(results, path=BASELINE_FILE):
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+def load_baseline(path=BASELINE_FILE):
+    with open(path) as f:
+        return json.load(f)
+
+def find_regressions(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """
+    Compares two result dicts and returns a list of
+    (metric, baseline_value, current_value, relative_change) for every metric
+    that got worse by more than `threshold`.
+    Raises ValueError if the two runs did not measure the same corpus.
+    """
+    old_corpus = baseline["meta"].get("corpus")
+    new_corpus = current["meta"].get("corpus")
+    if old_corpus != new_corpus:
+        raise ValueError(f"baseline corpus {old_corpus} differs from current corpus {new_corpus}; "
+                         "save a new baseline instead of comparing")
+
+    regressions = []
+    for name, old in baseline["metrics"].items():
+        new = current["metrics"].get(name)
+        if new is None or old == 0:
+            continue
+        change = (new - old) / old
+        worse = change > threshold if name in LOWER_IS_BETTER else change < -threshold
+        if worse:
+            regressions.append((name, old, new, change))
+    return regressions
+
+# ==========================================
+# MAIN
+# ==========================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for the search hot paths.")
+    parser.add_argument("--save", metavar="PATH", nargs="?", const=BASELINE_FILE,
+                        help=f"write results as a new baseline (default {BASELINE_FILE})")
+    parser.add_argument("--compare", metavar="PATH", nargs="?", const=BASELINE_FILE,
+                        help=f"compare against a baseline (default {BASELINE_FILE})")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="relative slowdown reported as a regression")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    args = parser.parse_args()
+
+    results = run_benchmarks(repeat=args.repeat)
+    print(f"Benchmarked {results['meta']['instances']} instances")
+    for name, value in results["metrics"].items():
+        print(f"  {name:<26} {value:14.2f}")
+
+    if args.save:
+        save_baseline(results, args.save)
+        print(f"Saved baseline to {args.save}")
+
+    if args.compare:
+        if not os.path.exists(args.compare):
+            print(f"[ERROR] Baseline not found: {args.compare}")
+            sys.exit(2)
+        try:
+            regressions = find_regressions(load_baseline(args.compare), results, args.threshold)
+        except ValueError as e:
+            print(f"[ERROR] {e}")
+            sys.exit(2)
+        if regressions:
+            print(f"\nREGRESSIONS (> {args.threshold:.0%}):")
+            for name, old, new, change in regressions:
+                print(f"  {name:<26} {old:14.2f} -> {new:14.2f} ({change:+.1%})")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.threshold:.0%}")
@@ -0,0 +1,34 @@
+import configparser
+import os
+
+# ==========================================
+# CONFIGURATION
+# ==========================================
+# Where the Fast Downward planner is looked up, first match wins:
+#   1. the RICOCHET_PLANNER_PATH environment variable
+#   2. `path` in the [planner] section of ricochet.ini (next to this file,
+#      or the file named by RICOCHET_CONFIG)
+#   3. DEFAULT_PLANNER_PATH
+#
+# Example ricochet.ini:
+#   [planner]
+#   path = /home/user/downward/fast-downward.py
+PLANNER_ENV_VAR = "RICOCHET_PLANNER_PATH"
+CONFIG_ENV_VAR = "RICOCHET_CONFIG"
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ricochet.ini")
+DEFAULT_PLANNER_PATH = "./fast_downward/fast-downward.py"
+
+def get_planner_path():
+    path = os.environ.get(PLANNER_ENV_VAR)
+    if path:
+        return path
+
+    config_file = os.environ.get(CONFIG_ENV_VAR, CONFIG_FILE)
+    if os.path.exists(config_file):
+        parser = configparser.ConfigParser()
+        parser.read(config_file)
+        path = parser.get("planner", "path", fallback=None)
+        if path:
+            return os.path.expanduser(path)
+
+    return DEFAULT_PLANNER_PATH
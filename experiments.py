@@ -1,70 +1,54 @@
 import time
-import random
 import csv
 import re
 import os
 import sys
+import platform
 import subprocess
-from ricochet_model import RicochetEnvironment, RicochetState
+from datetime import datetime
 from astar_solver import AStarSolver
 from pddl_generator import generate_pddl
-from main import parse_pddl_plan  # Reuse the parser from main
+from plan_processor import process_plan_file, InvalidPlanError
+from instance_filter import accept_instance
+from instance_generator import generate_random_instance  # Re-exported for older callers
+from config import get_planner_path
 
 # ==========================================
 # CONFIGURATION
 # ==========================================
-# UPDATE THIS to match your main.py path
-PLANNER_PATH = "/Users/andrea/Documents/GitHub/AIHW/fast_downward/fast-downward.py"
-OUTPUT_CSV = "experiment_results.csv"
+# Path to fast-downward.py: set RICOCHET_PLANNER_PATH or ricochet.ini (see config.py).
+PLANNER_PATH = get_planner_path()
 
-# ==========================================
-# 1. RANDOM INSTANCE GENERATOR
-# ==========================================
-def generate_random_instance(size, num_walls, num_robots=2, seed=None):
-    if seed: random.seed(seed)
-    
-    # 1. Generate Walls
-    # We simple-mindedly place walls between cells
-    walls = set()
-    while len(walls) < num_walls:
-        rx = random.randint(0, size-1)
-        ry = random.randint(0, size-1)
-        direction = random.choice(['north', 'south', 'east', 'west'])
-        
-        # Avoid blocking the edges (already boundaries)
-        if direction == 'north' and ry == 0: continue
-        if direction == 'south' and ry == size-1: continue
-        if direction == 'west' and rx == 0: continue
-        if direction == 'east' and rx == size-1: continue
-        
-        walls.add(((rx, ry), direction))
-        
-        # Add the reciprocal wall to make it solid from both sides
-        if direction == 'north': walls.add(((rx, ry-1), 'south'))
-        elif direction == 'south': walls.add(((rx, ry+1), 'north'))
-        elif direction == 'east': walls.add(((rx+1, ry), 'west'))
-        elif direction == 'west': walls.add(((rx-1, ry), 'east'))
-
-    # 2. Generate Robots
-    positions = set()
-    while len(positions) < num_robots:
-        positions.add((random.randint(0, size-1), random.randint(0, size-1)))
-    robots = list(positions)
-    
-    # 3. Goal
-    # Pick a random spot that isn't the start of the target robot
-    while True:
-        gx, gy = (random.randint(0, size-1), random.randint(0, size-1))
-        if (gx, gy) != robots[0]:
-            goal_pos = (gx, gy)
-            break
-            
-    env = RicochetEnvironment(size, walls, goal_pos, target_robot_index=0)
-    state = RicochetState(robots)
-    return env, state
+# One row per (instance, solver) run. Rows are appended and flushed as they
+# finish, so an interrupted sweep resumes where it stopped.
+# (experiment_results.csv holds the results of the original fixed sweep.)
+OUTPUT_CSV = "experiment_runs.csv"
+
+# Declarative experiment matrix. Every combination of size, wall density and
+# robot count is a cell; each cell runs every solver on up to
+# `instances_per_cell` instances, drawn in order from `seeds`.
+EXPERIMENT_MATRIX = {
+    "sizes": [5, 6, 7, 8, 9, 10],
+    "wall_density": [2.0],          # walls per row: num_walls = round(density * size)
+    "robots": [2],
+    "solvers": ["astar", "pddl"],   # keys of SOLVERS
+    "seeds": list(range(50)),
+    "instances_per_cell": 3,
+    # Instance prefilter: skip unsolvable boards and anything easier than this
+    # bucket (see instance_filter.BUCKETS) before paying for the solvers.
+    "min_difficulty": "easy",
+}
+
+CSV_FIELDS = [
+    "GridSize", "Walls", "Robots", "Seed", "Solver", "Bucket", "LowerBound",
+    "Time", "Expanded", "Cost", "Status", "Machine", "Started", "Finished",
+]
+
+# Columns that identify an (instance, solver) pair for checkpointing
+RUN_KEY = ["GridSize", "Walls", "Robots", "Seed", "Solver"]
 
 # ==========================================
-# 2. RUNNERS
+# 1. RUNNERS
 # ==========================================
 
 def run_astar_experiment(env, state):
@@ -114,6 +98,17 @@ def run_astar_experiment(env, state):
     
     return {"astar_time": "TIMEOUT", "astar_expanded": 0, "astar_cost": 0}
 
+def run_target_table_experiment(env, state):
+    solver = AStarSolver(env, None) # Builds its own heuristic: the target distance table
+    res = solver.solve_target_table(state)
+    if res:
+        return {
+            "table_time": res['time'],
+            "table_expanded": res['expanded'],
+            "table_cost": len(res['path']) - 1
+        }
+    return {"table_time": "TIMEOUT", "table_expanded": 0, "table_cost": 0}
+
 def run_pddl_experiment(env, state):
     # Reuse logic from main.py but parse more metrics
     domain_file = "domain.pddl"
@@ -131,10 +126,15 @@ def run_pddl_experiment(env, state):
     duration = time.time() - start_t
     
     if os.path.exists("sas_plan"):
-        # Read plan length
-        with open("sas_plan") as f:
-            plan = parse_pddl_plan(f.read())
-        os.remove("sas_plan")
+        # Validate the plan against the environment and compress the
+        # micro-steps into real moves, so the cost is comparable with A*
+        try:
+            plan = process_plan_file(env, state, "sas_plan")
+        except InvalidPlanError as e:
+            print(f"  Invalid plan: {e}")
+            return {"pddl_time": "INVALID", "pddl_expanded": 0, "pddl_cost": 0}
+        finally:
+            os.remove("sas_plan")
         
         # PARSE OUTPUT FOR "EXPANDED STATES"
         # Fast Downward usually prints: "Expanded X state(s)."
@@ -146,10 +146,123 @@ def run_pddl_experiment(env, state):
         return {
             "pddl_time": duration,
             "pddl_expanded": expanded,
-            "pddl_cost": len(plan) # This is micro-steps (slide start/move/stop)
+            "pddl_cost": plan["cost"]
         }
     return {"pddl_time": "TIMEOUT", "pddl_expanded": 0, "pddl_cost": 0}
 
+SOLVERS = {
+    "astar": (run_astar_experiment, "astar"),
+    "table": (run_target_table_experiment, "table"),
+    "pddl": (run_pddl_experiment, "pddl"),
+}
+
+def run_solver(name, env, state):
+    """
+    Runs one of SOLVERS and normalizes its result to time/expanded/cost.
+    """
+    runner, prefix = SOLVERS[name]
+    res = runner(env, state)
+    return {
+        "time": res[f"{prefix}_time"],
+        "expanded": res[f"{prefix}_expanded"],
+        "cost": res[f"{prefix}_cost"],
+    }
+
+# ==========================================
+# 2. EXPERIMENT MATRIX
+# ==========================================
+def matrix_cells(matrix):
+    """
+    Yields (size, num_walls, num_robots) for every cell of the matrix.
+    """
+    for size in matrix["sizes"]:
+        for density in matrix["wall_density"]:
+            for num_robots in matrix["robots"]:
+                yield size, int(round(density * size)), num_robots
+
+def load_checkpoint(output_csv):
+    """
+    Returns the set of RUN_KEY tuples already recorded in `output_csv`.
+    """
+    done = set()
+    if not os.path.exists(output_csv):
+        return done
+    with open(output_csv, newline="") as f:
+        reader = csv.DictReader(f)
+        if reader.fieldnames and reader.fieldnames != CSV_FIELDS:
+            raise ValueError(f"{output_csv} has columns {reader.fieldnames}, expected {CSV_FIELDS}")
+        for row in reader:
+            done.add(tuple(str(row[k]) for k in RUN_KEY))
+    return done
+
+def run_matrix(matrix=EXPERIMENT_MATRIX, output_csv=OUTPUT_CSV, resume=True):
+    """
+    Runs every (instance, solver) pair of the matrix that is not already in
+    `output_csv`. With resume=False the file is started from scratch.
+    """
+    unknown = [name for name in matrix["solvers"] if name not in SOLVERS]
+    if unknown:
+        raise ValueError(f"Unknown solvers {unknown}; choose from {list(SOLVERS)}")
+    if "pddl" in matrix["solvers"] and not os.path.exists(PLANNER_PATH):
+        raise FileNotFoundError(f"Planner executable not found at: {PLANNER_PATH}")
+
+    if not resume and os.path.exists(output_csv):
+        os.remove(output_csv)
+    done = load_checkpoint(output_csv)
+    if done:
+        print(f"Resuming: {len(done)} runs already in {output_csv}")
+
+    machine = platform.node()
+    new_file = not os.path.exists(output_csv)
+    with open(output_csv, "a", newline="") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=CSV_FIELDS)
+        if new_file:
+            writer.writeheader()
+
+        for size, num_walls, num_robots in matrix_cells(matrix):
+            print(f"\n=== Cell {size}x{size}, {num_walls} walls, {num_robots} robots ===")
+            accepted = 0
+            for seed in matrix["seeds"]:
+                if accepted == matrix["instances_per_cell"]:
+                    break
+
+                env, state = generate_random_instance(size, num_walls, num_robots=num_robots, seed=seed)
+
+                # Cheap pre-analysis before dispatching the solvers
+                ok, info = accept_instance(env, state, min_bucket=matrix["min_difficulty"])
+                if not ok:
+                    continue
+                accepted += 1
+
+                for solver in matrix["solvers"]:
+                    key = (size, num_walls, num_robots, seed, solver)
+                    if tuple(str(k) for k in key) in done:
+                        continue
+
+                    print(f"  seed {seed} ({info['bucket']}, lower bound {info['lower_bound']}): running {solver}...")
+                    started = datetime.now().astimezone().isoformat()
+                    res = run_solver(solver, env, state)
+                    finished = datetime.now().astimezone().isoformat()
+
+                    writer.writerow(dict(zip(RUN_KEY, key), **{
+                        "Bucket": info["bucket"],
+                        "LowerBound": info["lower_bound"],
+                        "Time": res["time"],
+                        "Expanded": res["expanded"],
+                        "Cost": res["cost"],
+                        "Status": {"TIMEOUT": "timeout", "INVALID": "invalid"}.get(res["time"], "solved"),
+                        "Machine": machine,
+                        "Started": started,
+                        "Finished": finished,
+                    }))
+                    # Checkpoint: make the row durable before the next run
+                    csvfile.flush()
+                    os.fsync(csvfile.fileno())
+                    print(f"    {solver}: {res['time']}s, expanded {res['expanded']}")
+
+            if accepted < matrix["instances_per_cell"]:
+                print(f"  Only {accepted} instances passed the prefilter for this cell")
+
 # ==========================================
 # 3. MAIN LOOP
 # ==========================================
@@ -159,42 +272,8 @@ if __name__ == "__main__":
         print("Please run this from the folder containing domain.pddl")
         sys.exit(1)
 
+    # Pass --fresh to discard previous results instead of resuming
+    resume = "--fresh" not in sys.argv[1:]
     print(f"Starting Experiments... saving to {OUTPUT_CSV}")
-    
-    with open(OUTPUT_CSV, "w", newline="") as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerow(["GridSize", "Walls", "AStar_Time", "AStar_Expanded", "PDDL_Time", "PDDL_Expanded"])
-        
-        # SCALING PARAMETER: Grid Size (N)
-        # We start small (5) and go up.
-        # Warning: A* gets slow very fast on large empty grids.
-        for size in [5, 6, 7, 8, 9, 10]: 
-            # Run 3 random instances per size to get an average
-            for i in range(3):
-                print(f"\n--- Running Size {size}x{size} (Iter {i+1}) ---")
-                
-                # Create instance (Walls scale with size, approx size*2)
-                env, state = generate_random_instance(size, num_walls=size*2, seed=i*size)
-                
-                # Run A*
-                print("  Running A*...")
-                astar_res = run_astar_experiment(env, state)
-                
-                # Run PDDL
-                print("  Running Planner...")
-                pddl_res = run_pddl_experiment(env, state)
-                
-                # Write row
-                writer.writerow([
-                    size, 
-                    size*2,
-                    astar_res["astar_time"],
-                    astar_res["astar_expanded"],
-                    pddl_res["pddl_time"],
-                    pddl_res["pddl_expanded"]
-                ])
-                
-                print(f"  Result: A*={astar_res['astar_time']}s, PDDL={pddl_res['pddl_time']}s")
-                csvfile.flush() # Save progress immediately
-
-    print("\nExperiments Completed")
\ No newline at end of file
+    run_matrix(EXPERIMENT_MATRIX, OUTPUT_CSV, resume=resume)
+    print("\nExperiments Completed")
@@ -0,0 +1,153 @@
+import random
+import time
+from collections import deque
+
+from ricochet_model import RicochetEnvironment, RicochetState, DIRECTIONS
+from astar_solver import AStarSolver
+
+class _SessionEnvironment(RicochetEnvironment):
+    """
+    Environment for one round that shares the session's line tables.
+    The tables only depend on the walls, not on the goal or the target
+    robot, so they are built once per board instead of once per round.
+    """
+    def __init__(self, session, goal_pos, target_robot_index):
+        super().__init__(session.size, session.walls, goal_pos, target_robot_index)
+        self._tables = session.board._line_tables()
+
+class RicochetSession:
+    """
+    A game on one board: robots stay where the previous round left them and
+    each round asks for a new (target robot, goal) pair.
+
+    Kept between rounds (board-level precomputation only; search trees
+    are goal-specific and start where the previous round ended, so they
+    are not carried over):
+      - the slide line tables of the board (see RicochetEnvironment)
+      - the robot-free slide graph of the board, computed once
+      - per-goal distance tables built from it (the heuristic_bfs values,
+        looked up instead of running a BFS per evaluation)
+    """
+    def __init__(self, size, walls, robots, mode="astar"):
+        """
+        mode: "astar" (AStarSolver.solve) or "table"
+              (AStarSolver.solve_target_table, optimal)
+        """
+        if mode not in ("astar", "table"):
+            raise ValueError(f"Unknown mode '{mode}'")
+        self.size = size
+        self.walls = walls
+        self.state = RicochetState(robots)
+        self.mode = mode
+
+        self.board = RicochetEnvironment(size, walls, None)
+        self._slide_graph = None
+        self._goal_distances = {}
+
+    # ==========================================
+    # BOARD-LEVEL PRECOMPUTATION
+    # ==========================================
+    def _reverse_slide_graph(self):
+        """
+        cell -> cells that reach it with one robot-free slide.
+        """
+        if self._slide_graph is None:
+            env = self.board
+            graph = {}
+            for x in range(self.size):
+                for y in range(self.size):
+                    for dx, dy in DIRECTIONS:
+                        stop = env._slide(x, y, dx, dy, ())
+                        if stop != (x, y):
+                            graph.setdefault(stop, []).append((x, y))
+            self._slide_graph = graph
+        return self._slide_graph
+
+    def goal_distances(self, goal_pos):
+        """
+        Robot-free slide distance from every cell to `goal_pos`, by one
+        backward BFS. Equal to heuristic_bfs for the target robot.
+        """
+        table = self._goal_distances.get(goal_pos)
+        if table is None:
+            graph = self._reverse_slide_graph()
+            table = {goal_pos: 0}
+            queue = deque([goal_pos])
+            while queue:
+                cell = queue.popleft()
+                for prev in graph.get(cell, ()):
+                    if prev not in table:
+                        table[prev] = table[cell] + 1
+                        queue.append(prev)
+            self._goal_distances[goal_pos] = table
+        return table
+
+    # ==========================================
+    # ROUNDS
+    # ==========================================
+    def solve_round(self, target_idx, goal_pos):
+        """
+        Solves one round from the current robot positions and, if solved,
+        moves the robots to the final state of the solution.
+        Returns the solver result dict, or None if the round is unsolvable.
+        """
+        env = _SessionEnvironment(self, goal_pos, target_idx)
+        solver = AStarSolver(env, None)
+        if self.mode == "table":
+            result = solver.solve_target_table(self.state)
+        else:
+            table = self.goal_distances(goal_pos)
+            inf = float('inf')
+            result = solver.solve(self.state, lambda state, env: table.get(state.robots[target_idx], inf))
+        if result is None:
+            return None
+
+        self.state = result["path"][-1]
+        return result
+
+    def play(self, rounds):
+        """
+        Plays a sequence of (target robot, goal) rounds in order.
+        Returns one result per round (None for unsolvable rounds, which
+        leave the robots where they are).
+        """
+        return [self.solve_round(target_idx, goal_pos) for target_idx, goal_pos in rounds]
+
+# ==========================================
+# DEMO: a full game against cold solves
+# ==========================================
+if __name__ == "__main__":
+    from instance_generator import generate_random_instance
+
+    SIZE, ROBOTS, ROUNDS = 10, 3, 17
+    env, start_state = generate_random_instance(SIZE, num_walls=SIZE*2, num_robots=ROBOTS, seed=7)
+    rng = random.Random(7)
+    rounds = [(rng.randrange(ROBOTS), (rng.randrange(SIZE), rng.randrange(SIZE))) for _ in range(ROUNDS)]
+
+    session = RicochetSession(SIZE, env.walls, start_state.robots)
+    t = time.time()
+    results = session.play(rounds)
+    session_time = time.time() - t
+
+    # Same rounds without the session: a fresh session per round (board
+    # tables rebuilt every time) and a plain AStarSolver with heuristic_bfs
+    from main import heuristic_bfs
+    state = start_state
+    fresh_time = cold_time = 0.0
+    for (target_idx, goal_pos), res in zip(rounds, results):
+        if res is None:
+            continue
+        t = time.time()
+        RicochetSession(SIZE, env.walls, state.robots).solve_round(target_idx, goal_pos)
+        fresh_time += time.time() - t
+        cold_env = RicochetEnvironment(SIZE, env.walls, goal_pos, target_robot_index=target_idx)
+        t = time.time()
+        AStarSolver(cold_env, heuristic_bfs).solve(state)
+        cold_time += time.time() - t
+        state = res["path"][-1]
+
+    solved = sum(res is not None for res in results)
+    print(f"Solved {solved}/{ROUNDS} rounds")
+    print(f"Session: {session_time:.3f}s")
+    print(f"Fresh session per round: {fresh_time:.3f}s")
+    print(f"Cold solves (heuristic_bfs): {cold_time:.3f}s")
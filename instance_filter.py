@@ -0,0 +1,238 @@
+from collections import deque
+
+from ricochet_model import DIRECTIONS
+
+# ==========================================
+# CONFIGURATION
+# ==========================================
+# Difficulty buckets, ordered from cheapest to most expensive.
+BUCKETS = ["unsolvable", "trivial", "easy", "medium", "hard"]
+
+# Upper bound (inclusive) on the estimated number of moves for each
+# solvable bucket. Anything above the last threshold is "hard".
+EASY_MAX_MOVES = 2
+MEDIUM_MAX_MOVES = 4
+
+# Boards whose state space (product of the robots' reachable areas) is at most
+# this size are checked exactly with a plain BFS, which is still far cheaper
+# than an A* run plus a planner subprocess.
+EXACT_CHECK_MAX_STATES = 5000
+
+# ==========================================
+# STATIC BOARD ANALYSIS
+# ==========================================
+def reachable_cells(env, start):
+    """
+    Cells a robot at `start` can ever occupy.
+    A robot only travels between adjacent cells that are not separated by a
+    wall, so the connected component of `start` is a superset of every
+    position it can reach, whatever the other robots do.
+    """
+    seen = {start}
+    queue = deque([start])
+    while queue:
+        cx, cy = queue.popleft()
+        for dx, dy in DIRECTIONS:
+            nx, ny = cx + dx, cy + dy
+            if not (0 <= nx < env.size and 0 <= ny < env.size):
+                continue
+            if env.is_wall_blocking(cx, cy, dx, dy) or (nx, ny) in seen:
+                continue
+            seen.add((nx, ny))
+            queue.append((nx, ny))
+    return seen
+
+def lower_bound_moves(env, state):
+    """
+    Admissible lower bound on the number of moves needed to solve the instance.
+    Relaxation: the target robot may stop on any cell along a wall-free line
+    (other robots can only shorten a slide, never extend it), and the moves of
+    helper robots are free. Returns float('inf') if the goal is unreachable.
+    """
+    start = state.robots[env.target_idx]
+    goal = env.goal_pos
+    if start == goal:
+        return 0
+
+    dist = {start: 0}
+    queue = deque([start])
+    while queue:
+        cx, cy = queue.popleft()
+        d = dist[(cx, cy)]
+        for dx, dy in DIRECTIONS:
+            x, y = cx, cy
+            # Every cell along the line is one "rook move" away
+            while (0 <= x + dx < env.size and 0 <= y + dy < env.size
+                   and not env.is_wall_blocking(x, y, dx, dy)):
+                x, y = x + dx, y + dy
+                if (x, y) in dist:
+                    continue
+                if (x, y) == goal:
+                    return d + 1
+                dist[(x, y)] = d + 1
+                queue.append((x, y))
+
+    return float('inf')
+
+def solo_distance(env, state):
+    """
+    Number of slides the target robot needs if the other robots were removed.
+    This is the same relaxation used by `heuristic_bfs`: cheap, not admissible
+    with helpers on the board, but a good proxy for how hard the instance is.
+    """
+    start = state.robots[env.target_idx]
+    goal = env.goal_pos
+    dist = {start: 0}
+    queue = deque([start])
+    while queue:
+        cx, cy = queue.popleft()
+        if (cx, cy) == goal:
+            return dist[(cx, cy)]
+        for dx, dy in DIRECTIONS:
+            nxt = env._slide(cx, cy, dx, dy, ())
+            if nxt not in dist:
+                dist[nxt] = dist[(cx, cy)] + 1
+                queue.append(nxt)
+    return float('inf')
+
+def stop_cells(env, state):
+    """
+    Over-approximation of the cells each robot can ever come to rest on.
+    A robot rests on its start cell or on a cell it can slide into that has a
+    blocker behind it: a wall, the board edge, or a cell some other robot can
+    itself rest on. Iterated to a fixed point; every real position of robot i
+    is in the i-th set, so a goal outside the target's set is unsolvable.
+    """
+    components = [reachable_cells(env, pos) for pos in state.robots]
+    stops = [{pos} for pos in state.robots]
+
+    changed = True
+    while changed:
+        changed = False
+        for i, component in enumerate(components):
+            others = set()
+            for j, cells in enumerate(stops):
+                if j != i:
+                    others |= cells
+            for (cx, cy) in component:
+                if (cx, cy) in stops[i]:
+                    continue
+                for dx, dy in DIRECTIONS:
+                    # Arriving while moving in (dx, dy) means coming from (cx-dx, cy-dy)
+                    px, py = cx - dx, cy - dy
+                    if (px, py) not in component or env.is_wall_blocking(px, py, dx, dy):
+                        continue
+                    bx, by = cx + dx, cy + dy
+                    if (not (0 <= bx < env.size and 0 <= by < env.size)
+                            or env.is_wall_blocking(cx, cy, dx, dy)
+                            or (bx, by) in others):
+                        stops[i].add((cx, cy))
+                        changed = True
+                        break
+    return stops
+
+def exact_distance(env, state, max_states=EXACT_CHECK_MAX_STATES):
+    """
+    Optimal number of moves by exhaustive BFS over the full state space, or
+    None if the state space may be larger than `max_states`.
+    Returns float('inf') for instances proven unsolvable.
+    """
+    bound = 1
+    for pos in state.robots:
+        bound *= len(reachable_cells(env, pos))
+    if bound > max_states:
+        return None
+
+    dist = {state: 0}
+    queue = deque([state])
+    while queue:
+        current = queue.popleft()
+        if env.is_goal(current):
+            return dist[current]
+        for neighbor, cost in env.get_neighbors(current):
+            if neighbor not in dist:
+                dist[neighbor] = dist[current] + cost
+                queue.append(neighbor)
+    return float('inf')
+
+def limited_distance(env, state, max_moves):
+    """
+    Optimal number of moves by exhaustive BFS cut off after `max_moves`
+    layers (at most ~(4 * robots) ** max_moves states, whatever the board),
+    or None if the instance needs more moves than that.
+    Returns float('inf') if the search runs out of states first.
+    """
+    if env.is_goal(state):
+        return 0
+    seen = {state.zhash}
+    frontier = [state]
+    for depth in range(1, max_moves + 1):
+        next_frontier = []
+        for current in frontier:
+            for robot_idx, new_pos, zhash in env.get_successor_deltas(current):
+                if zhash in seen:
+                    continue
+                seen.add(zhash)
+                neighbor = current.moved(robot_idx, new_pos, zhash)
+                if env.is_goal(neighbor):
+                    return depth
+                next_frontier.append(neighbor)
+        if not next_frontier:
+            return float('inf')
+        frontier = next_frontier
+    return None
+
+# ==========================================
+# CLASSIFICATION
+# ==========================================
+def classify_instance(env, state):
+    """
+    Cheap pre-analysis of an instance, run before any expensive solver.
+    Returns a dict with:
+        solvable:    False only when the instance is provably unsolvable
+        lower_bound: admissible lower bound on the solution length
+        estimate:    exact optimum on small boards and on instances solvable
+                     within MEDIUM_MAX_MOVES; otherwise a lower bound above it
+        exact:       True if `estimate` is the exact optimum
+        bucket:      one of BUCKETS
+    """
+    unsolvable = {"solvable": False, "lower_bound": float('inf'),
+                  "estimate": float('inf'), "exact": True, "bucket": "unsolvable"}
+
+    lower_bound = lower_bound_moves(env, state)
+    if lower_bound == float('inf') or env.goal_pos not in stop_cells(env, state)[env.target_idx]:
+        return unsolvable
+
+    estimate = exact_distance(env, state)
+    if estimate is None:
+        # Too big for a full BFS: every bucket below "hard" is still decided
+        # exactly by a search that stops after MEDIUM_MAX_MOVES moves
+        estimate = limited_distance(env, state, MEDIUM_MAX_MOVES)
+    exact = estimate is not None
+    if not exact:
+        estimate = max(lower_bound, MEDIUM_MAX_MOVES + 1)
+    elif estimate == float('inf'):
+        return unsolvable
+
+    if estimate <= 1:
+        bucket = "trivial"
+    elif estimate <= EASY_MAX_MOVES:
+        bucket = "easy"
+    elif estimate <= MEDIUM_MAX_MOVES:
+        bucket = "medium"
+    else:
+        # Optimum (or, past the cut-off, lower bound) above MEDIUM_MAX_MOVES
+        bucket = "hard"
+
+    return {"solvable": True, "lower_bound": estimate,
+            "estimate": estimate, "exact": exact, "bucket": bucket}
+
+def accept_instance(env, state, min_bucket="easy"):
+    """
+    True if the instance is at least as hard as `min_bucket`.
+    Unsolvable instances are always rejected.
+    """
+    info = classify_instance(env, state)
+    if not info["solvable"]:
+        return False, info
+    return BUCKETS.index(info["bucket"]) >= BUCKETS.index(min_bucket), info
@@ -0,0 +1,48 @@
+import random
+from ricochet_model import RicochetEnvironment, RicochetState
+
+# ==========================================
+# RANDOM INSTANCE GENERATOR
+# ==========================================
+def generate_random_instance(size, num_walls, num_robots=2, seed=None):
+    if seed is not None: random.seed(seed)
+    
+    # 1. Generate Walls
+    # We simple-mindedly place walls between cells
+    walls = set()
+    while len(walls) < num_walls:
+        rx = random.randint(0, size-1)
+        ry = random.randint(0, size-1)
+        direction = random.choice(['north', 'south', 'east', 'west'])
+        
+        # Avoid blocking the edges (already boundaries)
+        if direction == 'north' and ry == 0: continue
+        if direction == 'south' and ry == size-1: continue
+        if direction == 'west' and rx == 0: continue
+        if direction == 'east' and rx == size-1: continue
+        
+        walls.add(((rx, ry), direction))
+        
+        # Add the reciprocal wall to make it solid from both sides
+        if direction == 'north': walls.add(((rx, ry-1), 'south'))
+        elif direction == 'south': walls.add(((rx, ry+1), 'north'))
+        elif direction == 'east': walls.add(((rx+1, ry), 'west'))
+        elif direction == 'west': walls.add(((rx-1, ry), 'east'))
+
+    # 2. Generate Robots
+    positions = set()
+    while len(positions) < num_robots:
+        positions.add((random.randint(0, size-1), random.randint(0, size-1)))
+    robots = list(positions)
+    
+    # 3. Goal
+    # Pick a random spot that isn't the start of the target robot
+    while True:
+        gx, gy = (random.randint(0, size-1), random.randint(0, size-1))
+        if (gx, gy) != robots[0]:
+            goal_pos = (gx, gy)
+            break
+            
+    env = RicochetEnvironment(size, walls, goal_pos, target_robot_index=0)
+    state = RicochetState(robots)
+    return env, state
@@ -7,13 +7,13 @@ import subprocess
 from ricochet_model import RicochetEnvironment, RicochetState
 from astar_solver import AStarSolver
 from pddl_generator import generate_pddl
+from config import get_planner_path
 
 # ==========================================
 # CONFIGURATION
 # ==========================================
-# UPDATE THIS PATH to where your fast-downward.py is located.
-# Example: "./fast_downward/fast-downward.py" or "/home/user/downward/fast-downward.py"
-PLANNER_PATH = "/Users/andrea/Documents/GitHub/AIHW/fast_downward/fast-downward.py" 
+# Path to fast-downward.py: set RICOCHET_PLANNER_PATH or ricochet.ini (see config.py).
+PLANNER_PATH = get_planner_path()
 
 # ==========================================
 # HELPER FUNCTIONS
@@ -78,23 +78,25 @@ def heuristic_bfs(state, env):
                 queue.append((nx, ny, dist + 1))
                 
     return float('inf')
-def solve_with_pddl(env, start_state):
+def solve_with_pddl(env, start_state, verbose=True):
     """
     1. Generates problem.pddl
     2. Runs Fast Downward
     3. Parses output
+    verbose=False silences the progress messages; errors always go to stderr.
     """
     domain_filename = "domain.pddl"
     problem_filename = "problem.pddl"
     
     # 1. Generate the specific problem file
-    print(f"Generating {problem_filename}...")
+    if verbose:
+        print(f"Generating {problem_filename}...")
     generate_pddl(env, start_state, output_filename=problem_filename)
     
     # Check if planner exists
     if not os.path.exists(PLANNER_PATH):
-        print(f"\n[ERROR] Planner executable not found at: {PLANNER_PATH}")
-        print("Please edit the PLANNER_PATH variable in 'main.py' to point to your installation.")
+        print(f"\n[ERROR] Planner executable not found at: {PLANNER_PATH}", file=sys.stderr)
+        print("Set RICOCHET_PLANNER_PATH or the [planner] path in ricochet.ini (see config.py).", file=sys.stderr)
         return None
 
     # 2. Construct the command
@@ -107,7 +109,8 @@ def solve_with_pddl(env, start_state):
         problem_filename
     ]
     
-    print(f"Running Planner command: {' '.join(cmd)}")
+    if verbose:
+        print(f"Running Planner command: {' '.join(cmd)}")
     start_time = time.time()
     
     try:
@@ -118,22 +121,23 @@ def solve_with_pddl(env, start_state):
         
         # 3. Check results
         if result.returncode != 0:
-            print("Planner returned non-zero exit code.")
-            print(result.stderr) # Uncomment to debug planner errors
+            print("Planner returned non-zero exit code.", file=sys.stderr)
+            print(result.stderr, file=sys.stderr)
         
         # Fast Downward writes solution to 'sas_plan'
         if os.path.exists("sas_plan"):
-            print(f"Planner finished in {duration:.4f}s")
+            if verbose:
+                print(f"Planner finished in {duration:.4f}s")
             with open("sas_plan", "r") as f:
                 plan_content = f.read()
             os.remove("sas_plan") # Clean up
             return parse_pddl_plan(plan_content)
         else:
-            print("No 'sas_plan' file generated. Solution likely not found.")
+            print("No 'sas_plan' file generated. Solution likely not found.", file=sys.stderr)
             return None
             
     except Exception as e:
-        print(f"An error occurred while running planner: {e}")
+        print(f"An error occurred while running planner: {e}", file=sys.stderr)
         return None
 
 def parse_pddl_plan(plan_str):
@@ -0,0 +1,158 @@
+from ricochet_model import RicochetState, DIRECTION_NAMES, MOVE_COST
+
+# 'north' -> (0, -1), ...
+DIRECTION_VECTORS = {name: vec for vec, name in DIRECTION_NAMES.items()}
+
+class InvalidPlanError(ValueError):
+    """
+    Raised when a planner plan is not a legal Ricochet Robots solution
+    under RicochetEnvironment semantics.
+    """
+    def __init__(self, step_no, step, reason):
+        super().__init__(f"step {step_no} ({step}): {reason}")
+        self.step_no = step_no
+        self.step = step
+        self.reason = reason
+
+# ==========================================
+# READING
+# ==========================================
+def iter_plan_steps(source):
+    """
+    Yields plan steps ("move-slide r0 c_0_0 c_0_1 south") one at a time from
+    a sas_plan file path, an open file or any iterable of lines.
+    Comment lines (e.g. "; cost = 12") and blank lines are skipped.
+    """
+    if isinstance(source, str):
+        with open(source) as f:
+            yield from iter_plan_steps(f)
+        return
+    for line in source:
+        line = line.strip()
+        if not line or line.startswith(";"):
+            continue
+        yield line.strip("() ").lower()
+
+def _parse_cell(token):
+    _, x, y = token.split("_")
+    return int(x), int(y)
+
+def _parse_robot(token):
+    return int(token[1:])
+
+# ==========================================
+# SIMULATION
+# ==========================================
+def process_plan(env, start_state, steps):
+    """
+    Replays PDDL micro-steps against `env` and compresses them into real
+    moves. Every step is checked against the slide-stop logic: a slide may
+    only start and continue into free, unwalled cells, it stops exactly
+    where _slide would stop it, and only one robot moves at a time.
+
+    Returns a dict shaped like AStarSolver's result:
+        path:        list of RicochetState, one per real move (plus the start)
+        moves:       list of (robot index, direction name)
+        cost:        number of real moves
+        micro_steps: number of planner actions
+    Raises InvalidPlanError on the first illegal step, or if the plan ends
+    mid-slide or without reaching the goal.
+    """
+    state = start_state
+    path = [state]
+    moves = []
+    positions = list(state.robots)
+    occupied = set(positions)
+
+    # The slide in progress: (robot, direction name, start cell)
+    sliding = None
+    step_no = 0
+
+    def in_bounds(cell):
+        return 0 <= cell[0] < env.size and 0 <= cell[1] < env.size
+
+    for step_no, step in enumerate(steps, start=1):
+        parts = step.split()
+        try:
+            action = parts[0]
+            robot = _parse_robot(parts[1])
+            current = _parse_cell(parts[2])
+            direction = parts[-1]
+            dx, dy = DIRECTION_VECTORS[direction]
+            if action != "stop-slide-border":
+                nxt = _parse_cell(parts[3])
+        except (IndexError, KeyError, ValueError):
+            raise InvalidPlanError(step_no, step, "cannot parse step")
+
+        def fail(reason):
+            raise InvalidPlanError(step_no, step, reason)
+
+        if not 0 <= robot < len(positions):
+            fail(f"unknown robot r{robot}")
+        if positions[robot] != current:
+            fail(f"r{robot} is at {positions[robot]}, not {current}")
+        if action != "stop-slide-border" and nxt != (current[0] + dx, current[1] + dy):
+            fail(f"{nxt} is not the {direction} neighbour of {current}")
+
+        if action in ("start-slide", "move-slide"):
+            if action == "start-slide" and sliding is not None:
+                fail(f"r{sliding[0]} is still sliding")
+            if action == "move-slide" and (sliding is None or sliding[:2] != (robot, direction)):
+                fail(f"r{robot} is not sliding {direction}")
+            if not in_bounds(nxt) or env.is_wall_blocking(current[0], current[1], dx, dy):
+                fail("slides through a wall")
+            if nxt in occupied:
+                fail("slides into another robot")
+
+            if action == "start-slide":
+                sliding = (robot, direction, current)
+            else:
+                occupied.discard(current)
+                occupied.add(nxt)
+                positions[robot] = nxt
+
+        elif action in ("stop-slide-wall", "stop-slide-robot", "stop-slide-border"):
+            if sliding is None or sliding[:2] != (robot, direction):
+                fail(f"r{robot} is not sliding {direction}")
+
+            # The stop reason must hold, as in the domain's preconditions
+            if action == "stop-slide-wall" and not (
+                    in_bounds(nxt) and env.is_wall_blocking(current[0], current[1], dx, dy)):
+                fail(f"no wall between {current} and {nxt}")
+            if action == "stop-slide-robot" and nxt not in occupied:
+                fail(f"no robot on {nxt}")
+            if action == "stop-slide-border" and in_bounds((current[0] + dx, current[1] + dy)):
+                fail(f"{current} is not on the {direction} border")
+
+            # The stop must be the one _slide computes for this move
+            start = sliding[2]
+            others = occupied - {current}
+            expected = env._slide(start[0], start[1], dx, dy, others)
+            if expected != current:
+                fail(f"slide from {start} going {direction} stops at {expected}, not {current}")
+
+            sliding = None
+            state = RicochetState(positions)
+            path.append(state)
+            moves.append((robot, direction))
+
+        else:
+            fail(f"unknown action '{action}'")
+
+    if sliding is not None:
+        raise InvalidPlanError(step_no, "<end of plan>", f"r{sliding[0]} is still sliding")
+    if not env.is_goal(state):
+        raise InvalidPlanError(step_no, "<end of plan>", "plan does not reach the goal")
+
+    return {
+        "path": path,
+        "moves": moves,
+        "cost": len(moves) * MOVE_COST,
+        "micro_steps": step_no,
+    }
+
+def process_plan_file(env, start_state, plan_path="sas_plan"):
+    """
+    Streams a sas_plan file through process_plan.
+    """
+    return process_plan(env, start_state, iter_plan_steps(plan_path))
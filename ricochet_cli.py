@@ -0,0 +1,162 @@
+"""
+Single command-line entry point.
+
+    python ricochet_cli.py solve      [--size N --walls W --robots R --seed S | --demo] [--solver astar|table|pddl] [--json]
+    python ricochet_cli.py experiment [--sizes ...] [--robots ...] [--density ...] [--solvers ...] [--fresh]
+    python ricochet_cli.py plot       [results files, directories or globs ...]
+    python ricochet_cli.py visualise  [--size N --seed S | --demo] [--solver astar|pddl] [--out FILE]
+
+Every subcommand imports what it needs inside its handler, so solver runs
+never pay for matplotlib, pandas or seaborn. The planner location comes
+from config.py (RICOCHET_PLANNER_PATH or ricochet.ini).
+"""
+import argparse
+import sys
+
+# ==========================================
+# SHARED HELPERS
+# ==========================================
+def _add_instance_args(parser, default_size=6):
+    parser.add_argument("--demo", action="store_true", help="use the fixed 5x5 scenario from main.py")
+    parser.add_argument("--size", type=int, default=default_size)
+    parser.add_argument("--walls", type=int, default=None, help="number of walls (default 2*size)")
+    parser.add_argument("--robots", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+
+def _load_instance(args):
+    if args.demo:
+        from main import create_simple_scenario
+        return create_simple_scenario()
+    from instance_generator import generate_random_instance
+    walls = args.walls if args.walls is not None else args.size * 2
+    return generate_random_instance(args.size, walls, num_robots=args.robots, seed=args.seed)
+
+# ==========================================
+# SUBCOMMANDS
+# ==========================================
+def cmd_solve(args):
+    env, start_state = _load_instance(args)
+
+    if args.solver == "pddl":
+        from main import solve_with_pddl
+        from plan_processor import process_plan, InvalidPlanError
+        # --json output must stay a single line: no planner progress messages
+        plan = solve_with_pddl(env, start_state, verbose=not args.json)
+        if plan is None:
+            return 1
+        try:
+            result = process_plan(env, start_state, plan)
+        except InvalidPlanError as e:
+            print(f"Invalid plan: {e}", file=sys.stderr)
+            return 1
+    elif args.solver == "table":
+        from astar_solver import AStarSolver
+        result = AStarSolver(env, None).solve_target_table(start_state)
+    else:
+        from astar_solver import AStarSolver
+        from main import heuristic_bfs
+        result = AStarSolver(env, heuristic_bfs).solve(start_state)
+
+    if result is None:
+        print("No solution found.", file=sys.stderr)
+        return 1
+    if args.json:
+        import json
+        out = dict(result, path=[list(state.robots) for state in result["path"]])
+        print(json.dumps(out))
+    else:
+        if "time" in result:
+            print(f"Time: {result['time']:.4f}s")
+            print(f"Nodes Expanded: {result['expanded']}")
+        print(f"Moves: {len(result['path']) - 1}")
+        for i, state in enumerate(result["path"]):
+            print(f"  {i}: {state.robots}")
+    return 0
+
+def cmd_experiment(args):
+    import experiments
+    matrix = dict(experiments.EXPERIMENT_MATRIX)
+    for key, value in (("sizes", args.sizes), ("robots", args.robots), ("wall_density", args.density),
+                       ("solvers", args.solvers), ("instances_per_cell", args.per_cell),
+                       ("min_difficulty", args.min_difficulty)):
+        if value is not None:
+            matrix[key] = value
+    if args.seeds is not None:
+        matrix["seeds"] = list(range(args.seeds))
+
+    experiments.run_matrix(matrix, args.output or experiments.OUTPUT_CSV, resume=not args.fresh)
+    print("\nExperiments Completed")
+    return 0
+
+def cmd_plot(args):
+    import shower
+    shower.plot_experiments(args.inputs)
+    return 0
+
+def cmd_visualise(args):
+    import visualiser
+    env, start_state = _load_instance(args)
+
+    if args.solver == "pddl":
+        from main import solve_with_pddl
+        solution = solve_with_pddl(env, start_state)
+    else:
+        from astar_solver import AStarSolver
+        from main import heuristic_bfs
+        solution = AStarSolver(env, heuristic_bfs).solve(start_state)
+    if not solution:
+        print("No solution found.")
+        return 1
+
+    history = visualiser.solution_to_history(env, start_state, solution)
+    title = f"Ricochet Solution ({len(history) - 1} steps)"
+    if args.out:
+        print(f"Saved {visualiser.render_to_file(env, history, args.out, title=title)}")
+    else:
+        visualiser.animate_ricochet(env, history, title=title)
+    return 0
+
+# ==========================================
+# MAIN
+# ==========================================
+def build_parser():
+    parser = argparse.ArgumentParser(prog="ricochet", description="Ricochet Robots solvers and experiments.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("solve", help="solve one instance")
+    _add_instance_args(p)
+    p.add_argument("--solver", choices=["astar", "table", "pddl"], default="astar",
+                   help="table: optimal A* with a target distance table")
+    p.add_argument("--json", action="store_true", help="print the result as one JSON line")
+    p.set_defaults(func=cmd_solve)
+
+    p = sub.add_parser("experiment", help="run (or resume) the experiment matrix")
+    p.add_argument("--sizes", type=int, nargs="+")
+    p.add_argument("--robots", type=int, nargs="+")
+    p.add_argument("--density", type=float, nargs="+", help="walls per row")
+    p.add_argument("--solvers", nargs="+")
+    p.add_argument("--seeds", type=int, help="number of candidate seeds per cell")
+    p.add_argument("--per-cell", type=int, help="instances per cell")
+    p.add_argument("--min-difficulty", help="prefilter bucket (see instance_filter.BUCKETS)")
+    p.add_argument("--output", help="run log (default experiments.OUTPUT_CSV)")
+    p.add_argument("--fresh", action="store_true", help="discard previous results instead of resuming")
+    p.set_defaults(func=cmd_experiment)
+
+    p = sub.add_parser("plot", help="aggregate results and draw the plots")
+    p.add_argument("inputs", nargs="*")
+    p.set_defaults(func=cmd_plot)
+
+    p = sub.add_parser("visualise", help="animate or render a solution")
+    _add_instance_args(p)
+    p.add_argument("--solver", choices=["astar", "pddl"], default="astar")
+    p.add_argument("--out", help="write .gif/.mp4/.png instead of opening a window")
+    p.set_defaults(func=cmd_visualise)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,21 +3,70 @@ import sys
 # Directions
 UP, DOWN, LEFT, RIGHT = (0, -1), (0, 1), (-1, 0), (1, 0)
 DIRECTIONS = [UP, DOWN, LEFT, RIGHT]
+DIRECTION_INDEX = {d: i for i, d in enumerate(DIRECTIONS)}
+
+# Names used by the wall set and the PDDL encoding
+DIRECTION_NAMES = {UP: 'north', DOWN: 'south', LEFT: 'west', RIGHT: 'east'}
+
+# Every move costs 1
+MOVE_COST = 1
+
+# Zobrist hashing: one pseudo-random 64-bit key per (robot index, cell). A state's
+# hash is the XOR of the keys of its robots, so moving one robot updates it
+# with two XORs instead of rehashing the whole tuple.
+class _ZobristKeys(dict):
+    """
+    (robot index, (x, y)) -> 64-bit key, computed on first use.
+    Keys are a fixed function of the seed and the cell (splitmix64), so they
+    agree across processes whatever order cells are first seen in.
+    """
+    MASK = (1 << 64) - 1
+
+    def __init__(self, seed):
+        super().__init__()
+        self.seed = seed
+
+    def __missing__(self, key):
+        robot_idx, (x, y) = key
+        z = (self.seed + ((robot_idx << 42) | (x << 21) | y) * 0x9E3779B97F4A7C15) & self.MASK
+        z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & self.MASK
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & self.MASK
+        value = self[key] = z ^ (z >> 31)
+        return value
+
+ZOBRIST_KEYS = _ZobristKeys(0x5EED)
+
+def zobrist_hash(robots):
+    h = 0
+    for i, pos in enumerate(robots):
+        h ^= ZOBRIST_KEYS[(i, pos)]
+    return h
 
 class RicochetState:
     """
     Represents a snapshot of the board.
     robots: A tuple of (x, y) coordinates for all robots. 
             Standardize: robots[0] is usually the target robot.
+    zhash:  Zobrist hash of `robots`; computed if not given.
     """
-    def __init__(self, robots):
+    __slots__ = ("robots", "zhash")
+
+    def __init__(self, robots, zhash=None):
         self.robots = tuple(robots) # Tuple is hashable
+        self.zhash = zobrist_hash(self.robots) if zhash is None else zhash
         
     def __eq__(self, other):
-        return self.robots == other.robots
+        return self.zhash == other.zhash and self.robots == other.robots
     
     def __hash__(self):
-        return hash(self.robots)
+        return self.zhash
+
+    def moved(self, robot_idx, new_pos, zhash):
+        """
+        Materializes the successor described by a delta from get_successor_deltas.
+        """
+        robots = self.robots
+        return RicochetState(robots[:robot_idx] + (new_pos,) + robots[robot_idx + 1:], zhash)
     
     def __repr__(self):
         return str(self.robots)
@@ -35,56 +84,106 @@ class RicochetEnvironment:
         self.walls = walls # Logic depends on how you store walls (cells vs edges)
         self.goal_pos = goal_pos
         self.target_idx = target_robot_index
+        self._tables = None # Line tables, built on first use (walls are static)
+
+    def _line_tables(self):
+        """
+        Board-level slide tables, shared by every robot and every state.
+        Cells are numbered y*size + x, and a set of robots is a bitmask of
+        their cell numbers.
+          bits:  (x, y) -> 1 << cell number
+          cells: cell number -> (x, y)
+          rays:  (x, y) -> one (mask, step, wall_stop, ascending) per entry of
+                 DIRECTIONS: the cells a slide passes before a wall or the
+                 edge, the cell-number step, where the slide ends with no
+                 robots in the way, and whether the cell numbers increase
+                 along the ray (then the first robot hit is the lowest bit).
+        """
+        if self._tables is None:
+            size = self.size
+            cells = [(x, y) for y in range(size) for x in range(size)]
+            bits = {pos: 1 << n for n, pos in enumerate(cells)}
+            rays = {}
+            for (x, y) in cells:
+                entries = []
+                for dx, dy in DIRECTIONS:
+                    mask = 0
+                    cx, cy = x, y
+                    while (0 <= cx + dx < size and 0 <= cy + dy < size
+                           and not self.is_wall_blocking(cx, cy, dx, dy)):
+                        cx, cy = cx + dx, cy + dy
+                        mask |= bits[(cx, cy)]
+                    step = dy * size + dx
+                    entries.append((mask, step, (cx, cy), step > 0))
+                rays[(x, y)] = entries
+            self._tables = (bits, cells, rays)
+        return self._tables
 
     def get_neighbors(self, state):
         """
-        Generates valid child states.
+        Generates valid child states as (state, cost) pairs.
         Logic: Pick every robot, try to slide it in every 4 directions.
         """
-        neighbors = []
-        current_positions = set(state.robots)
+        robots = state.robots
+        return [(RicochetState(robots[:i] + (new_pos,) + robots[i + 1:], zhash), MOVE_COST)
+                for i, new_pos, zhash in self.get_successor_deltas(state)]
 
-        for i, (rx, ry) in enumerate(state.robots):
-            for dx, dy in DIRECTIONS:
-                # Calculate the slide
-                new_x, new_y = self._slide(rx, ry, dx, dy, current_positions)
+    def get_successor_deltas(self, state):
+        """
+        Returns (robot index, new position, new Zobrist hash) for every move,
+        without building the child states. Use state.moved(...) to materialize
+        the ones that are actually needed.
+        """
+        bits, cells, rays = self._line_tables()
+        deltas = []
+        robots = state.robots
+        keys = ZOBRIST_KEYS
+
+        # Occupancy bitmask of this state
+        occupied = 0
+        for pos in robots:
+            occupied |= bits[pos]
+
+        for i, pos in enumerate(robots):
+            base = state.zhash ^ keys[(i, pos)]
+            for mask, step, wall_stop, ascending in rays[pos]:
+                # First robot on the ray, if any, stops the slide one cell short
+                hits = mask & occupied
+                if hits:
+                    hit = (hits & -hits).bit_length() - 1 if ascending else hits.bit_length() - 1
+                    new_pos = cells[hit - step]
+                else:
+                    new_pos = wall_stop
                 
                 # If the robot actually moved
-                if (new_x, new_y) != (rx, ry):
-                    new_robots = list(state.robots)
-                    new_robots[i] = (new_x, new_y)
-                    
-                    # Calculate cost (usually 1 move = cost 1)
-                    cost = 1 
-                    neighbors.append((RicochetState(new_robots), cost))
-        
-        return neighbors
+                if new_pos != pos:
+                    deltas.append((i, new_pos, base ^ keys[(i, new_pos)]))
+
+        return deltas
 
     def _slide(self, x, y, dx, dy, all_robot_positions):
         """
         Moves from x,y in direction dx,dy until hitting a wall or robot.
         Returns the final coordinates.
         """
-        cx, cy = x, y
-        
-        while True:
-            nx, ny = cx + dx, cy + dy
-            
-            # 1. Check Board Boundaries
-            if not (0 <= nx < self.size and 0 <= ny < self.size):
-                return cx, cy
-            
-            # 2. Check Static Walls (Implementation depends on your wall data structure)
-            # if self.is_wall_blocking(cx, cy, dx, dy): return cx, cy
-            
-            # 3. Check Other Robots
-            if (nx, ny) in all_robot_positions:
-                return cx, cy
-            
-            # If clear, advance
-            cx, cy = nx, ny
-            
-        return cx, cy
+        bits, cells, rays = self._line_tables()
+        mask, step, wall_stop, ascending = rays[(x, y)][DIRECTION_INDEX[(dx, dy)]]
+
+        hits = 0
+        for pos in all_robot_positions:
+            hits |= bits.get(pos, 0)
+        hits &= mask
+        if not hits:
+            return wall_stop
+        hit = (hits & -hits).bit_length() - 1 if ascending else hits.bit_length() - 1
+        return cells[hit - step]
+
+    def is_wall_blocking(self, x, y, dx, dy):
+        """
+        True if a wall stops movement from (x, y) in direction (dx, dy).
+        Walls are stored on both sides, so one lookup is enough.
+        """
+        return ((x, y), DIRECTION_NAMES[(dx, dy)]) in self.walls
 
     def is_goal(self, state):
         return state.robots[self.target_idx] == self.goal_pos
\ No newline at end of file
@@ -1,3 +1,7 @@
+import glob
+import os
+import sys
+
 import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
@@ -7,76 +11,252 @@ import seaborn as sns
 sns.set_theme(style="whitegrid")
 plt.rcParams.update({'font.size': 12})
 
-INPUT_FILE = "experiment_results.csv"
+# Default inputs: the resumable run log from experiments.py, falling back to
+# the results of the original fixed sweep. Any number of files, directories
+# (partitioned results) or glob patterns can be passed on the command line.
+INPUT_FILE = "experiment_runs.csv"
+LEGACY_INPUT_FILE = "experiment_results.csv"
+OUTPUT_SUMMARY = "experiment_summary.csv"
 OUTPUT_TIME_PLOT = "time_plot.png"
 OUTPUT_NODES_PLOT = "nodes_plot.png"
+OUTPUT_SOLVE_RATE_PLOT = "solve_rate_plot.png"
 
-def plot_experiments():
-    # 1. Load Data
-    try:
-        df = pd.read_csv(INPUT_FILE)
-    except FileNotFoundError:
-        print(f"Error: Could not find {INPUT_FILE}. Run experiments.py first.")
-        return
+# Rows are read this many at a time, so memory does not grow with the file
+CHUNK_SIZE = 200_000
 
-    # 2. Data Cleaning
-    # Convert 'TIMEOUT' to NaN so pandas can handle it (it won't plot them)
-    # or you can set it to a high number to show it went off the chart.
-    # Here we convert to numeric, coercing errors (TIMEOUT) to NaN.
-    df['AStar_Time'] = pd.to_numeric(df['AStar_Time'], errors='coerce')
-    df['PDDL_Time'] = pd.to_numeric(df['PDDL_Time'], errors='coerce')
-    
-    # Fill NaNs with a specific value if you want to show them as "maxed out"
-    # or just drop them to show gaps. Let's keep them as NaN to break the line.
-    
-    # 3. Aggregation (Average over the 3 iterations per size)
-    grouped = df.groupby('GridSize').mean()
-    
-    # ==========================================
-    # PLOT 1: RUNTIME
-    # ==========================================
-    plt.figure(figsize=(10, 6))
-    
-    # Plot A* Time
-    plt.plot(grouped.index, grouped['AStar_Time'], marker='o', label='A* (Custom)', linewidth=2, markersize=8)
-    
-    # Plot PDDL Time
-    plt.plot(grouped.index, grouped['PDDL_Time'], marker='s', label='PDDL (Fast Downward)', linewidth=2, markersize=8)
-    
-    plt.title('Average Runtime: A* vs PDDL', fontsize=16)
-    plt.xlabel('Grid Size (NxN)', fontsize=14)
-    plt.ylabel('Time (seconds)', fontsize=14)
-    plt.legend()
-    plt.yscale('log') # Log scale is often better if A* is super fast vs PDDL overhead
-    plt.grid(True, which="both", ls="-", alpha=0.5)
-    
-    plt.tight_layout()
-    plt.savefig(OUTPUT_TIME_PLOT)
-    print(f"Saved {OUTPUT_TIME_PLOT}")
-    plt.close()
+# Configuration columns results are grouped by, when the file has them
+DIMENSIONS = ["GridSize", "Walls", "Robots", "Solver", "Bucket"]
+# Dimension on the x axis of every plot
+PLOT_X = "GridSize"
+# Dimensions that are stratified in the summary but pooled in the plots
+POOLED_IN_PLOTS = ["Bucket"]
+
+# Quantiles come from fixed log-spaced histograms, so they are approximate
+# (relative error about one bin width, ~2%) but can be merged across chunks.
+TIME_BINS = np.logspace(-6, 5, 1101)        # 1 microsecond .. ~28 hours
+EXPANDED_BINS = np.logspace(0, 10, 1001)    # 1 .. 10^10 nodes
+
+# ==========================================
+# READING
+# ==========================================
+def resolve_inputs(args):
+    """
+    Expands files, directories and glob patterns into a list of result files.
+    """
+    if not args:
+        args = [INPUT_FILE] if os.path.exists(INPUT_FILE) else [LEGACY_INPUT_FILE]
+
+    paths = []
+    for arg in args:
+        if os.path.isdir(arg):
+            for ext in ("csv", "parquet"):
+                paths.extend(glob.glob(os.path.join(arg, "**", f"*.{ext}"), recursive=True))
+        elif any(ch in arg for ch in "*?["):
+            paths.extend(glob.glob(arg, recursive=True))
+        else:
+            paths.append(arg)
+    return sorted(set(paths))
+
+def iter_chunks(paths, chunksize=CHUNK_SIZE):
+    """
+    Yields DataFrames of at most `chunksize` rows from CSV or Parquet files.
+    Parquet needs pyarrow, which is only imported when such a file is seen.
+    """
+    for path in paths:
+        if path.endswith(".parquet"):
+            try:
+                import pyarrow.parquet as pq
+            except ImportError:
+                print(f"Skipping {path}: reading Parquet requires pyarrow (pip install pyarrow)")
+                continue
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+                yield batch.to_pandas()
+        else:
+            for chunk in pd.read_csv(path, chunksize=chunksize):
+                yield chunk
+
+def to_long(chunk):
+    """
+    Normalizes a chunk to one row per (instance, solver) run with columns
+    Solver, Time, Expanded and Solved. The old wide format (AStar_* and
+    PDDL_* columns) is melted into that shape.
+    """
+    if "Solver" not in chunk.columns:
+        parts = []
+        for solver, prefix in (("astar", "AStar"), ("pddl", "PDDL")):
+            if f"{prefix}_Time" not in chunk.columns:
+                continue
+            part = chunk.drop(columns=[c for c in chunk.columns if c.startswith(("AStar_", "PDDL_"))])
+            part["Solver"] = solver
+            part["Time"] = chunk[f"{prefix}_Time"]
+            part["Expanded"] = chunk[f"{prefix}_Expanded"]
+            parts.append(part)
+        chunk = pd.concat(parts, ignore_index=True)
+
+    # Timeouts stay in the data as unsolved runs instead of vanishing as NaN
+    chunk["Time"] = pd.to_numeric(chunk["Time"], errors="coerce")
+    chunk["Expanded"] = pd.to_numeric(chunk["Expanded"], errors="coerce")
+    solved = chunk["Time"].notna()
+    if "Status" in chunk.columns:
+        solved &= chunk["Status"] == "solved"
+    chunk["Solved"] = solved
+    return chunk
+
+# ==========================================
+# STREAMING AGGREGATION
+# ==========================================
+class RunStats:
+    """
+    Mergeable summary of a group of runs: run and solve counts plus
+    histograms of the solve time and expanded nodes of solved runs.
+    """
+    def __init__(self):
+        self.runs = 0
+        self.solved = 0
+        self.time_hist = np.zeros(len(TIME_BINS) - 1, dtype=np.int64)
+        self.expanded_hist = np.zeros(len(EXPANDED_BINS) - 1, dtype=np.int64)
+
+    def add(self, group):
+        self.runs += len(group)
+        solved = group[group["Solved"]]
+        self.solved += len(solved)
+        times = np.clip(solved["Time"].to_numpy(dtype=float), TIME_BINS[0], TIME_BINS[-1])
+        self.time_hist += np.histogram(times, bins=TIME_BINS)[0]
+        expanded = solved["Expanded"].dropna().to_numpy(dtype=float)
+        expanded = np.clip(expanded, EXPANDED_BINS[0], EXPANDED_BINS[-1])
+        self.expanded_hist += np.histogram(expanded, bins=EXPANDED_BINS)[0]
+
+    def merge(self, other):
+        self.runs += other.runs
+        self.solved += other.solved
+        self.time_hist += other.time_hist
+        self.expanded_hist += other.expanded_hist
+
+    def summary(self):
+        return {
+            "Runs": self.runs,
+            "Solved": self.solved,
+            "SolveRate": self.solved / self.runs if self.runs else np.nan,
+            "Time_Median": hist_quantile(self.time_hist, TIME_BINS, 0.50),
+            "Time_P90": hist_quantile(self.time_hist, TIME_BINS, 0.90),
+            "Time_P99": hist_quantile(self.time_hist, TIME_BINS, 0.99),
+            "Expanded_Median": hist_quantile(self.expanded_hist, EXPANDED_BINS, 0.50),
+        }
 
-    # ==========================================
-    # PLOT 2: NODES EXPANDED
-    # ==========================================
+def hist_quantile(hist, bins, q):
+    """
+    Quantile of a log-binned histogram (geometric centre of the bin).
+    """
+    total = hist.sum()
+    if total == 0:
+        return np.nan
+    idx = int(np.searchsorted(np.cumsum(hist), q * total))
+    return float(np.sqrt(bins[idx] * bins[idx + 1]))
+
+def aggregate(paths, chunksize=CHUNK_SIZE):
+    """
+    Streams all input files and returns ({group key: RunStats}, dimensions),
+    where the dimensions are the DIMENSIONS columns present in any input.
+    Runs from files that lack one of them have None in that key position.
+    """
+    stats = {}
+    present = set()
+    for chunk in iter_chunks(paths, chunksize):
+        chunk = to_long(chunk)
+        # Group every chunk by all DIMENSIONS, missing ones as NaN, so keys
+        # line up between files written with different columns
+        present.update(d for d in DIMENSIONS if d in chunk.columns)
+        chunk = chunk.reindex(columns=list(chunk.columns) + [d for d in DIMENSIONS if d not in chunk.columns])
+        for key, group in chunk.groupby(DIMENSIONS, sort=False, dropna=False):
+            key = tuple(None if pd.isna(v) else v for v in key)
+            stats.setdefault(key, RunStats()).add(group)
+
+    dims = [d for d in DIMENSIONS if d in present]
+    merged = {}
+    for key, run_stats in stats.items():
+        sub_key = tuple(v for d, v in zip(DIMENSIONS, key) if d in present)
+        merged.setdefault(sub_key, RunStats()).merge(run_stats)
+    return merged, dims
+
+def summarize(stats, dims, keep=None):
+    """
+    Builds a summary DataFrame, pooling every dimension not in `keep`.
+    """
+    keep = dims if keep is None else [d for d in dims if d in keep]
+    pooled = {}
+    for key, run_stats in stats.items():
+        sub_key = tuple(v for d, v in zip(dims, key) if d in keep)
+        pooled.setdefault(sub_key, RunStats()).merge(run_stats)
+
+    rows = [dict(zip(keep, key), **run_stats.summary()) for key, run_stats in pooled.items()]
+    summary = pd.DataFrame(rows)
+    return summary.sort_values(keep).reset_index(drop=True) if keep else summary
+
+# ==========================================
+# PLOTTING
+# ==========================================
+def plot_metric(summary, x, series, columns, ylabel, title, output, log=True):
+    """
+    One line per combination of the `series` dimensions for every column in
+    `columns` (dict column -> line style).
+    """
     plt.figure(figsize=(10, 6))
-    
-    # Plot A* Expanded
-    plt.plot(grouped.index, grouped['AStar_Expanded'], marker='o', label='A* Nodes', color='tab:blue', linewidth=2)
-    
-    # Plot PDDL Expanded
-    plt.plot(grouped.index, grouped['PDDL_Expanded'], marker='s', label='PDDL Nodes', color='tab:orange', linewidth=2)
-    
-    plt.title('Search Space Explored: Nodes Expanded', fontsize=16)
-    plt.xlabel('Grid Size (NxN)', fontsize=14)
-    plt.ylabel('Number of Nodes (Log Scale)', fontsize=14)
-    plt.yscale('log') # Crucial because A* expands WAY more
-    plt.legend()
+    groups = summary.groupby(series, sort=True) if series else [((), summary)]
+    for key, group in groups:
+        key = key if isinstance(key, tuple) else (key,)
+        label = ", ".join(f"{d}={v}" for d, v in zip(series, key)) or "all"
+        group = group.sort_values(x)
+        for column, style in columns.items():
+            suffix = "" if len(columns) == 1 else f" ({column.split('_')[-1]})"
+            plt.plot(group[x], group[column], style, marker='o', label=label + suffix, linewidth=2, markersize=6)
+
+    plt.title(title, fontsize=16)
+    plt.xlabel('Grid Size (NxN)' if x == "GridSize" else x, fontsize=14)
+    plt.ylabel(ylabel, fontsize=14)
+    if log:
+        plt.yscale('log')
+    plt.legend(fontsize=9)
     plt.grid(True, which="both", ls="-", alpha=0.5)
-    
+
     plt.tight_layout()
-    plt.savefig(OUTPUT_NODES_PLOT)
-    print(f"Saved {OUTPUT_NODES_PLOT}")
+    plt.savefig(output)
+    print(f"Saved {output}")
     plt.close()
 
+def plot_experiments(inputs=None):
+    # 1. Load and aggregate the data chunk by chunk
+    paths = resolve_inputs(inputs or [])
+    missing = [p for p in paths if not os.path.exists(p)]
+    if not paths or missing:
+        print(f"Error: Could not find {missing or 'any result files'}. Run experiments.py first.")
+        return
+
+    stats, dims = aggregate(paths)
+    if not stats:
+        print("Error: no results found in the input files.")
+        return
+
+    # 2. Full summary, stratified by every dimension the data has
+    summary = summarize(stats, dims)
+    summary.to_csv(OUTPUT_SUMMARY, index=False)
+    print(f"Saved {OUTPUT_SUMMARY} ({len(summary)} configurations)")
+
+    # 3. Plots: x axis PLOT_X, one series per value of the other dimensions
+    # that actually vary in the data
+    plot_dims = [d for d in dims if d not in POOLED_IN_PLOTS]
+    plot_summary = summarize(stats, dims, keep=plot_dims)
+    if not plot_dims:
+        print("Error: the results have no configuration columns to plot against.")
+        return
+    x = PLOT_X if PLOT_X in plot_dims else plot_dims[0]
+    series = [d for d in plot_dims if d != x and plot_summary[d].nunique() > 1]
+
+    plot_metric(plot_summary, x, series, {"Time_Median": "-", "Time_P90": "--"},
+                'Time (seconds)', 'Runtime: median and p90 of solved runs', OUTPUT_TIME_PLOT)
+    plot_metric(plot_summary, x, series, {"Expanded_Median": "-"},
+                'Number of Nodes (Log Scale)', 'Search Space Explored: median nodes expanded', OUTPUT_NODES_PLOT)
+    plot_metric(plot_summary, x, series, {"SolveRate": "-"},
+                'Fraction of runs solved', 'Solve Rate', OUTPUT_SOLVE_RATE_PLOT, log=False)
+
 if __name__ == "__main__":
-    plot_experiments()
\ No newline at end of file
+    plot_experiments(sys.argv[1:])
@@ -1,7 +1,13 @@
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 import matplotlib.patches as patches
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import multiprocessing
 import random
+import shutil
+import subprocess
 import sys
 import os
 
@@ -10,12 +16,6 @@ from ricochet_model import RicochetEnvironment, RicochetState
 from pddl_generator import generate_pddl
 from main import solve_with_pddl, create_simple_scenario
 
-# ==========================================
-# CONFIGURATION
-# ==========================================
-# Update this to match your main.py
-PLANNER_PATH = "/Users/andrea/Documents/GitHub/AIHW/fast_downward/fast-downward.py"
-
 # ==========================================
 # PARSER LOGIC
 # ==========================================
@@ -57,9 +57,40 @@ def parse_plan_to_states(env, start_state, plan_steps):
             
     return history
 
+def solution_to_history(env, start_state, solution):
+    """
+    Converts any solver output into a list of robot positions per frame:
+      - an AStarSolver result dict (uses its "path")
+      - a list of RicochetState (one frame per real move)
+      - a PDDL plan as a list of step strings (one frame per micro-step)
+    """
+    if isinstance(solution, dict):
+        solution = solution["path"]
+    if solution and isinstance(solution[0], RicochetState):
+        return [list(state.robots) for state in solution]
+    return parse_plan_to_states(env, start_state, solution)
+
 # ==========================================
 # VISUALIZATION LOGIC
 # ==========================================
+def wall_segments(env):
+    """
+    Line segments for every wall, in cell-centre coordinates.
+    Wall logic: if wall at (x,y) facing 'south', draw line between (x, y+1) and (x+1, y+1)
+    Note: Our coordinates are centers. Grid lines are at +0.5 / -0.5
+    """
+    segments = []
+    for (wx, wy), direction in env.walls:
+        if direction == 'north':
+            segments.append([(wx-0.5, wy-0.5), (wx+0.5, wy-0.5)])
+        elif direction == 'south':
+            segments.append([(wx-0.5, wy+0.5), (wx+0.5, wy+0.5)])
+        elif direction == 'east':
+            segments.append([(wx+0.5, wy-0.5), (wx+0.5, wy+0.5)])
+        elif direction == 'west':
+            segments.append([(wx-0.5, wy-0.5), (wx-0.5, wy+0.5)])
+    return segments
+
 def animate_ricochet(env, history, title="Ricochet Solution"):
     """
     Creates a Matplotlib animation of the solution.
@@ -74,18 +105,8 @@ def animate_ricochet(env, history, title="Ricochet Solution"):
     ax.grid(True, color='lightgray', linestyle='-')
     ax.set_aspect('equal')
     
-    # 2. Draw Static Walls
-    # Wall logic: if wall at (x,y) facing 'south', draw line between (x, y+1) and (x+1, y+1)
-    # Note: Our coordinates are centers. Grid lines are at +0.5 / -0.5
-    for (wx, wy), direction in env.walls:
-        if direction == 'north':
-            ax.plot([wx-0.5, wx+0.5], [wy-0.5, wy-0.5], color='black', linewidth=3)
-        elif direction == 'south':
-            ax.plot([wx-0.5, wx+0.5], [wy+0.5, wy+0.5], color='black', linewidth=3)
-        elif direction == 'east':
-            ax.plot([wx+0.5, wx+0.5], [wy-0.5, wy+0.5], color='black', linewidth=3)
-        elif direction == 'west':
-            ax.plot([wx-0.5, wx-0.5], [wy-0.5, wy+0.5], color='black', linewidth=3)
+    # 2. Draw Static Walls (one collection instead of a plot call per wall)
+    ax.add_collection(LineCollection(wall_segments(env), colors='black', linewidths=3))
 
     # 3. Draw Goal
     gx, gy = env.goal_pos
@@ -119,11 +140,163 @@ def animate_ricochet(env, history, title="Ricochet Solution"):
     print("Close the window to exit script.")
     plt.show()
 
+# ==========================================
+# HEADLESS RENDERING
+# ==========================================
+# Renderers are cached per board, so the static background (grid, walls,
+# goal) is drawn once and every frame only redraws the robots.
+RENDERER_CACHE_SIZE = 32
+_renderer_cache = {}
+
+class BoardRenderer:
+    """
+    Off-screen renderer for one board (no pyplot, no GUI backend).
+    """
+    def __init__(self, env, num_robots, figsize=(6, 6), dpi=100):
+        self.fig = Figure(figsize=figsize, dpi=dpi)
+        self.canvas = FigureCanvasAgg(self.fig)
+        ax = self.fig.add_subplot()
+        self.ax = ax
+
+        ax.set_xlim(-0.5, env.size - 0.5)
+        ax.set_ylim(env.size - 0.5, -0.5) # Invert Y so (0,0) is top-left
+        ax.set_xticks(range(env.size))
+        ax.set_yticks(range(env.size))
+        ax.grid(True, color='lightgray', linestyle='-')
+        ax.set_aspect('equal')
+        ax.add_collection(LineCollection(wall_segments(env), colors='black', linewidths=3))
+
+        gx, gy = env.goal_pos
+        ax.add_patch(patches.Rectangle((gx-0.5, gy-0.5), 1, 1, color='gold', alpha=0.3))
+        ax.text(gx, gy, "GOAL", ha='center', va='center', fontsize=8, fontweight='bold', color='goldenrod')
+        # The title and the robots are animated artists: they are left out of
+        # the cached background, so one background serves every solution
+        self.title = ax.set_title("", animated=True)
+        self.robots = []
+        for i in range(num_robots):
+            color = 'red' if i == env.target_idx else 'blue'
+            circle = patches.Circle((0, 0), 0.3, color=color, ec='black', animated=True)
+            ax.add_patch(circle)
+            self.robots.append(circle)
+
+        self.background = None
+
+    def set_title(self, title):
+        self.title.set_text(title)
+
+    def render(self, positions):
+        """
+        Returns the frame for one set of robot positions as an RGBA memoryview
+        (valid until the next call).
+        """
+        if self.background is None:
+            self.canvas.draw()
+            self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self.canvas.restore_region(self.background)
+        self.ax.draw_artist(self.title)
+        for circle, (rx, ry) in zip(self.robots, positions):
+            circle.center = (rx, ry)
+            self.ax.draw_artist(circle)
+        return self.canvas.buffer_rgba()
+
+    @property
+    def frame_size(self):
+        width, height = self.canvas.get_width_height()
+        return width, height
+
+def get_renderer(env, num_robots):
+    key = (env.size, frozenset(env.walls), env.goal_pos, env.target_idx, num_robots)
+    renderer = _renderer_cache.get(key)
+    if renderer is None:
+        if len(_renderer_cache) >= RENDERER_CACHE_SIZE:
+            _renderer_cache.pop(next(iter(_renderer_cache)))
+        renderer = BoardRenderer(env, num_robots)
+        _renderer_cache[key] = renderer
+    return renderer
+
+def render_to_file(env, history, output, title="Ricochet Solution", fps=7):
+    """
+    Renders a solution history headlessly. The format follows the extension:
+      .mp4 - frames are piped straight into ffmpeg
+      .gif - written frame by frame with Pillow (one palette, taken
+             from the first frame)
+      .png - one file per frame; `output` may contain a {} placeholder for
+             the frame index, otherwise "_0000" etc. is appended to the name
+    """
+    renderer = get_renderer(env, len(history[0]))
+    renderer.set_title(title)
+    width, height = renderer.frame_size
+    ext = os.path.splitext(output)[1].lower()
+
+    if ext == ".mp4":
+        if shutil.which("ffmpeg") is None:
+            raise RuntimeError("Rendering MP4 requires ffmpeg on the PATH")
+        cmd = ["ffmpeg", "-y", "-loglevel", "error",
+               "-f", "rawvideo", "-pix_fmt", "rgba", "-s", f"{width}x{height}", "-r", str(fps),
+               "-i", "-", "-pix_fmt", "yuv420p", output]
+        proc = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+        for positions in history:
+            proc.stdin.write(renderer.render(positions))
+        proc.stdin.close()
+        if proc.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed while writing {output}")
+
+    elif ext == ".gif":
+        # Image.save(save_all=True) keeps every frame in memory, so the GIF
+        # blocks are written by hand as each frame is rendered
+        from PIL import Image, GifImagePlugin
+        duration = int(1000 / fps)
+        palette = None
+        with open(output, "wb") as f:
+            for positions in history:
+                frame = Image.frombuffer("RGBA", (width, height), renderer.render(positions), "raw", "RGBA", 0, 1).convert("RGB")
+                if palette is None:
+                    frame = palette = frame.quantize(colors=256)
+                    header, _ = GifImagePlugin.getheader(frame, info={"loop": 0, "duration": duration})
+                    f.write(b"".join(header))
+                else:
+                    frame = frame.quantize(palette=palette, dither=Image.Dither.NONE)
+                for block in GifImagePlugin.getdata(frame, duration=duration):
+                    f.write(block)
+            f.write(b";") # GIF trailer
+
+    elif ext == ".png":
+        from PIL import Image
+        pattern = output if "{" in output else output[:-len(ext)] + "_{:04d}" + ext
+        for i, positions in enumerate(history):
+            Image.frombuffer("RGBA", (width, height), renderer.render(positions), "raw", "RGBA", 0, 1).save(pattern.format(i))
+
+    else:
+        raise ValueError(f"Unsupported output format '{ext}' (use .mp4, .gif or .png)")
+
+    return output
+
+def _render_job(job):
+    env, history, output, title = job
+    return render_to_file(env, history, output, title=title)
+
+def render_many(jobs, processes=None):
+    """
+    Renders many solutions in parallel.
+    jobs: list of (env, history, output, title) tuples.
+    Returns the output paths in the same order as `jobs`. Internally jobs
+    run grouped by board so each worker reuses its cached backgrounds.
+    """
+    order = sorted(range(len(jobs)), key=lambda i: (jobs[i][0].size, sorted(jobs[i][0].walls), jobs[i][0].goal_pos))
+    with multiprocessing.Pool(processes) as pool:
+        chunksize = max(1, len(jobs) // (4 * (processes or os.cpu_count() or 1)))
+        outputs = pool.map(_render_job, [jobs[i] for i in order], chunksize=chunksize)
+
+    results = [None] * len(jobs)
+    for i, output in zip(order, outputs):
+        results[i] = output
+    return results
+
 # ==========================================
 # MAIN DRIVER
 # ==========================================
 if __name__ == "__main__":
-    from experiments import generate_random_instance
+    from instance_generator import generate_random_instance
     
     print("--- Ricochet Visualizer ---")
     
@@ -139,10 +312,6 @@ if __name__ == "__main__":
     print(f"Goal: {env.goal_pos}")
     print("Solving with PDDL (this may take a second)...")
     
-    # We must patch the PLANNER_PATH in main if it wasn't set globally there
-    import main
-    main.PLANNER_PATH = PLANNER_PATH 
-    
     # Run Solver
     plan = solve_with_pddl(env, start_state)
     
@@ -153,6 +322,11 @@ if __name__ == "__main__":
         history = parse_plan_to_states(env, start_state, plan)
         
         print(f"Animation has {len(history)} frames.")
-        animate_ricochet(env, history, title=f"Ricochet Solution ({len(history)} micro-steps)")
+        title = f"Ricochet Solution ({len(history)} micro-steps)"
+        if len(sys.argv) > 1:
+            # Headless: python visualiser.py solution.gif|solution.mp4|frames.png
+            print(f"Saved {render_to_file(env, history, sys.argv[1], title=title)}")
+        else:
+            animate_ricochet(env, history, title=title)
     else:
         print("No solution found (or planner failed). Try running again for a different board.")
\ No newline at end of file